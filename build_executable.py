@@ -142,6 +142,7 @@ def build_executable():
         "--hidden-import=src.audio.processing",
         "--hidden-import=src.llm.suggestion",
         "--hidden-import=src.transcription.whisper",
+        "--hidden-import=src.utils.ffmpeg_utils",
         "--hidden-import=src.utils.json_utils",
         "--hidden-import=src.utils.srt_utils",
         "--hidden-import=src.video.editor",
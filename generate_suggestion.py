@@ -1,11 +1,10 @@
 import glob
-import json
 import os
 from datetime import datetime
 
 from src.llm.suggestion import get_llm_suggestion
-from src.utils.json_utils import save_json
-from src.utils.srt_utils import create_srt_from_json
+from src.utils.json_utils import load_json, save_json
+from src.utils.srt_utils import save_srt
 
 
 def find_latest_transcription():
@@ -29,8 +28,7 @@ def generate_suggestion():
         print(f"Found latest transcription file: {transcription_file}")
         
         # Read the transcription file
-        with open(transcription_file, 'r', encoding='utf-8') as f:
-            transcription = json.load(f)
+        transcription = load_json(transcription_file)
         
         # Generate suggestion using LLM
         print("Generating suggestion using LLM...")
@@ -42,11 +40,8 @@ def generate_suggestion():
         print(f"Saved LLM suggestion to: {suggestion_file}")
 
         # Create SRT file from the suggestion JSON
-        os.makedirs("subtitles", exist_ok=True)
-        srt_content = create_srt_from_json(suggestion["filtered_transcription"])
         srt_file = os.path.join("subtitles", f"{base_name}.srt")
-        with open(srt_file, "w", encoding="utf-8") as f:
-            f.write(srt_content)
+        save_srt(suggestion["filtered_transcription"], srt_file)
         print(f"Saved SRT file to: {srt_file}")
         
         return suggestion_file
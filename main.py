@@ -1,18 +1,57 @@
-import glob
+import argparse
+import hashlib
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-from pydub import AudioSegment
-
-from src.audio.processing import detect_segments, extract_audio
+from src.audio.processing import detect_segments, load_audio
 from src.llm.suggestion import get_llm_suggestion
 from src.transcription.whisper import transcribe_segments
-from src.utils.json_utils import save_json
-from src.utils.srt_utils import create_srt_from_json
+from src.utils.json_utils import load_json, save_json
+from src.utils.srt_utils import save_srt
 from src.video.editor import create_final_video
 
 
+def is_up_to_date(output_path, source_path):
+    """Check whether output_path exists and is newer than source_path."""
+    return os.path.exists(output_path) and os.path.getmtime(
+        output_path
+    ) >= os.path.getmtime(source_path)
+
+
+def source_stamp(source_path):
+    """Identify the current version of a source file by its mtime and size."""
+    stat = os.stat(source_path)
+    return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+
+def matches_stamp(stamp_path, stamp):
+    """Check whether stamp_path records exactly the given source stamp."""
+    try:
+        return load_json(stamp_path) == stamp
+    except (OSError, ValueError):
+        return False
+
+
+# Segment detection settings; with these fixed, the segments depend only on the audio
+DETECTION_PARAMS = {"chunk_ms": 100}
+
+
+def audio_cache_key(audio, detection_params, language=None):
+    """Hash decoded audio, the segment detection settings and the transcription
+    language into a transcription cache key."""
+    digest = hashlib.blake2b(audio.raw_data, digest_size=16)
+    digest.update(repr((sorted(detection_params.items()), language)).encode("utf-8"))
+    return digest.hexdigest()
+
+
 def process_video(
-    video_path, generate_srt=True, generate_video=True, output_video=None
+    video_path,
+    generate_srt=True,
+    generate_video=True,
+    output_video=None,
+    debug=False,
+    language=None,
 ):
     """
     Process a video file to extract audio, transcribe it, get suggestions, and optionally
@@ -23,6 +62,9 @@ def process_video(
         generate_srt (bool): Whether to generate an SRT subtitle file
         generate_video (bool): Whether to generate an edited video
         output_video (str, optional): Path for the output video. If None, creates in the 'edited' folder.
+        debug (bool): Whether to also save the raw detected segments as JSON
+        language (str, optional): ISO-639-1 code of the spoken language. If None,
+            Whisper detects it for each segment.
 
     Returns:
         bool: True if successful
@@ -34,46 +76,74 @@ def process_video(
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Create necessary directories relative to the script directory
-    os.makedirs(os.path.join(script_dir, "audio"), exist_ok=True)
     os.makedirs(os.path.join(script_dir, "jsons"), exist_ok=True)
     os.makedirs(os.path.join(script_dir, "edited"), exist_ok=True)
     os.makedirs(os.path.join(script_dir, "subtitles"), exist_ok=True)
 
-    # Step 1: Extract full audio from the video
-    temp_audio_file = os.path.join(script_dir, "audio", f"{base_name}_temp_audio.wav")
-    extract_audio(video_path, temp_audio_file)
-
-    # Step 2: Load audio and detect segments based on sound levels
-    audio = AudioSegment.from_file(temp_audio_file)
-    raw_segments = detect_segments(audio, chunk_ms=100)
-    raw_segments_file = os.path.join(
-        script_dir, "jsons", f"{base_name}_raw_segments.json"
-    )
-    save_json(raw_segments, raw_segments_file)
-    print(f"Saved raw segments JSON to {raw_segments_file}")
-
-    # Step 3: For each segment, transcribe the audio using Whisper
-    raw_transcription = transcribe_segments(audio, raw_segments)
-    raw_transcription_file = os.path.join(
-        script_dir, "jsons", f"{base_name}_transcription.json"
-    )
-    save_json(raw_transcription, raw_transcription_file)
-    print(f"Saved raw transcription JSON to {raw_transcription_file}")
-
-    os.remove(temp_audio_file)
+    # All JSON dumps for this video share the same path prefix
+    json_prefix = os.path.join(script_dir, "jsons", base_name)
+
+    # Steps 1-3 are skipped when the transcription was made from this exact
+    # version of the video in the requested language. The video's mtime and size
+    # and the language are recorded next to the transcription, so a different
+    # take copied with the old timestamp or a change of language is caught
+    raw_transcription_file = f"{json_prefix}_transcription.json"
+    stamp_file = f"{json_prefix}_transcription_source.json"
+    stamp = {**source_stamp(video_path), "language": language}
+    if os.path.exists(raw_transcription_file) and matches_stamp(stamp_file, stamp):
+        raw_transcription = load_json(raw_transcription_file)
+        print(f"Reusing raw transcription JSON from {raw_transcription_file}")
+    else:
+        # Step 1: Decode the audio track straight into memory (16 kHz mono)
+        audio = load_audio(video_path)
+
+        # Transcriptions are cached by audio content, so a renamed or copied video
+        # skips both segment detection and the Whisper requests
+        cache_key = audio_cache_key(audio, DETECTION_PARAMS, language)
+        cache_file = os.path.join(script_dir, "jsons", "cache", f"{cache_key}.json")
+        # Checked once so both steps agree even if another worker touches the entry
+        cache_hit = os.path.exists(cache_file)
+
+        # Step 2: Detect segments based on sound levels (only needed on a cache
+        # miss, or to dump them for debugging)
+        if debug or not cache_hit:
+            raw_segments = detect_segments(audio, **DETECTION_PARAMS)
+            if debug:
+                raw_segments_file = f"{json_prefix}_raw_segments.json"
+                save_json(raw_segments, raw_segments_file)
+                print(f"Saved raw segments JSON to {raw_segments_file}")
+
+        # Step 3: For each segment, transcribe the audio using Whisper
+        if cache_hit:
+            raw_transcription = load_json(cache_file)
+            print(f"Reusing cached transcription from {cache_file}")
+        else:
+            raw_transcription = transcribe_segments(
+                audio, raw_segments, language=language
+            )
+            # Write then rename so other workers never read a partial file
+            tmp_cache_file = f"{cache_file}.{os.getpid()}.tmp"
+            save_json(raw_transcription, tmp_cache_file, pretty=False)
+            os.replace(tmp_cache_file, cache_file)
+        save_json(raw_transcription, raw_transcription_file)
+        save_json(stamp, stamp_file, pretty=False)
+        print(f"Saved raw transcription JSON to {raw_transcription_file}")
 
     # Step 4: Send raw transcription to an LLM for filtering and save suggestion JSON locally
-    suggestion = get_llm_suggestion(raw_transcription)
-    suggestion_file = os.path.join(script_dir, "jsons", f"{base_name}_suggestion.json")
-    save_json(suggestion, suggestion_file)
-    print(f"Saved LLM suggestion JSON to {suggestion_file}")
+    # (skipped when the suggestion is newer than the transcription)
+    suggestion_file = f"{json_prefix}_suggestion.json"
+    if is_up_to_date(suggestion_file, raw_transcription_file):
+        suggestion = load_json(suggestion_file)
+        print(f"Reusing LLM suggestion JSON from {suggestion_file}")
+    else:
+        suggestion = get_llm_suggestion(raw_transcription)
+        save_json(suggestion, suggestion_file)
+        print(f"Saved LLM suggestion JSON to {suggestion_file}")
 
     # Step 5: Create SRT file if requested
     if generate_srt:
-        srt_content = create_srt_from_json(suggestion)
         srt_file = os.path.join(script_dir, "subtitles", f"{base_name}.srt")
-        with open(srt_file, "w", encoding="utf-8") as f:
-            f.write(srt_content)
+        save_srt(suggestion, srt_file)
         print(f"Saved SRT file to {srt_file}")
 
     # Step 6: Create the final video if requested
@@ -86,15 +156,37 @@ def process_video(
     return True
 
 
-def main():
-    """Process all video files in the 'raw' directory"""
-    video_files = glob.glob("raw/*")
-    for video_file in video_files:
-        if os.path.isfile(video_file) and video_file.lower().endswith(
-            (".mp4", ".mov", ".avi", ".mkv")
-        ):
-            process_video(video_file)
+def main(max_workers=2, language=None):
+    """Process all video files in the 'raw' directory
+
+    Videos are independent, so up to max_workers of them are processed in
+    parallel worker processes. The default is kept low because each video
+    already runs a multi-threaded ffmpeg encode and concurrent API requests.
+    language is passed on to process_video for every video.
+    """
+    if not os.path.isdir("raw"):
+        return
+    # scandir reports the entry type from the directory listing itself,
+    # so filtering does not need an extra stat per file
+    with os.scandir("raw") as entries:
+        video_files = sorted(
+            entry.path
+            for entry in entries
+            if entry.is_file()
+            and entry.name.lower().endswith((".mp4", ".mov", ".avi", ".mkv"))
+        )
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(partial(process_video, language=language), video_files))
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Process all video files in the 'raw' directory."
+    )
+    parser.add_argument(
+        "--language",
+        help="ISO-639-1 code of the spoken language, e.g. 'en' "
+        "(detected by Whisper for each segment if omitted)",
+    )
+    args = parser.parse_args()
+    main(language=args.language)
@@ -1,13 +1,44 @@
+import numpy as np
 import webrtcvad
-from moviepy.editor import VideoFileClip
 from pydub import AudioSegment
 
+from src.utils.ffmpeg_utils import run_ffmpeg
 
-def extract_audio(video_path, audio_path):
-    """Extract audio from video file."""
-    video = VideoFileClip(video_path)
-    video.audio.write_audiofile(audio_path, logger=None)
-    video.close()
+
+def extract_audio(video_path, audio_path, sample_rate=16000):
+    """
+    Extract audio from video file as a mono 16-bit WAV. Both the VAD and Whisper
+    work on 16 kHz mono, so downsampling here keeps later steps from processing
+    the source's full rate and channel count.
+    """
+    run_ffmpeg([
+        "-y",
+        "-loglevel", "error",
+        "-i", video_path,
+        "-vn",
+        "-acodec", "pcm_s16le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        audio_path,
+    ])
+
+def load_audio(video_path, sample_rate=16000):
+    """
+    Decode the audio track of a video straight into memory as mono 16-bit PCM,
+    without writing an intermediate WAV file.
+    """
+    pcm = run_ffmpeg([
+        "-loglevel", "error",
+        "-i", video_path,
+        "-vn",
+        "-f", "s16le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "-",
+    ], capture_stdout=True)
+    return AudioSegment(
+        data=pcm, sample_width=2, frame_rate=sample_rate, channels=1
+    )
 
 def detect_segments(
     audio,
@@ -43,46 +74,38 @@ def detect_segments(
     frame_size = int(sample_rate * frame_duration_ms / 1000)
     frame_bytes = frame_size * sample_width
 
-    # Split raw audio into frames of exact length.
-    frames = []
-    for i in range(0, len(raw_audio) - frame_bytes + 1, frame_bytes):
-        frame = raw_audio[i : i + frame_bytes]
-        timestamp = i / (sample_rate * sample_width)
-        frames.append((timestamp, frame))
+    # Split raw audio into frames of exact length. Frames are zero-copy views
+    # into the PCM buffer, and their byte offsets give their timestamps.
+    bytes_per_second = sample_rate * sample_width
+    frame_offsets = range(0, len(raw_audio) - frame_bytes + 1, frame_bytes)
+    pcm = memoryview(raw_audio)
 
     # Label each frame using VAD.
-    speech_flags = []
-    for timestamp, frame in frames:
+    speech_flags = np.zeros(len(frame_offsets), dtype=bool)
+    for k, i in enumerate(frame_offsets):
         try:
-            is_speech = vad.is_speech(frame, sample_rate)
+            speech_flags[k] = vad.is_speech(pcm[i : i + frame_bytes], sample_rate)
         except Exception as e:
-            print(f"Error processing frame at {timestamp:.2f} sec: {e}")
-            is_speech = False
-        speech_flags.append((timestamp, is_speech))
+            print(f"Error processing frame at {i / bytes_per_second:.2f} sec: {e}")
 
-    # Aggregate contiguous speech frames into segments
-    segments = []
-    segment_start = None
-    last_speech_timestamp = None
-    for timestamp, is_speech in speech_flags:
-        if is_speech:
-            if segment_start is None:
-                segment_start = round(timestamp, 2)  # Round to 2 decimal places
-            last_speech_timestamp = timestamp
-        else:
-            if segment_start is not None and last_speech_timestamp is not None:
-                segments.append({
-                    "start": round(segment_start, 2),  # Round to 2 decimal places
-                    "end": round(last_speech_timestamp + post_speech_padding_sec, 2),  # Round to 2 decimal places
-                })
-                segment_start = None
-                last_speech_timestamp = None
-    if segment_start is not None:
-        total_duration = len(raw_audio) / (sample_rate * sample_width)
-        segments.append({
-            "start": round(segment_start, 2),  # Round to 2 decimal places
-            "end": round(total_duration, 2)  # Round to 2 decimal places
-        })
+    # Aggregate contiguous speech frames into segments. Runs of speech frames
+    # begin where the zero-padded flags step up and end where they step down.
+    edges = np.diff(np.concatenate(([0], speech_flags.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1).tolist()
+    run_ends = (np.flatnonzero(edges == -1) - 1).tolist()
+    segments = [
+        {
+            "start": round(frame_offsets[first] / bytes_per_second, 2),
+            "end": round(
+                frame_offsets[last] / bytes_per_second + post_speech_padding_sec, 2
+            ),
+        }
+        for first, last in zip(run_starts, run_ends)
+    ]
+    # A run still open at the end of the audio extends to its full duration
+    if run_ends and run_ends[-1] == len(frame_offsets) - 1:
+        total_duration = len(raw_audio) / bytes_per_second
+        segments[-1]["end"] = round(total_duration, 2)  # Round to 2 decimal places
 
     # Merge segments that are separated by less than padding_duration_ms.
     merged_segments = []
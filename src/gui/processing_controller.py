@@ -19,7 +19,7 @@ from src.audio.processing import detect_segments, extract_audio
 from src.llm.suggestion import get_llm_suggestion
 from src.transcription.whisper import transcribe_segments
 from src.utils.json_utils import load_json, save_json
-from src.utils.srt_utils import create_srt_from_json
+from src.utils.srt_utils import save_srt
 from src.video.editor import create_final_video
 
 
@@ -49,6 +49,7 @@ class ProcessingController:
         self.video_path = None
         self.base_name = None
         self.audio_file = None
+        self.audio = None  # Decoded audio kept between detection and transcription
         self.segments_file = None
         self.transcription_file = None
         self.suggestion_file = None
@@ -98,6 +99,7 @@ class ProcessingController:
         """Set the video path and derive related file paths"""
         self.video_path = video_path
         self.base_name = os.path.splitext(os.path.basename(video_path))[0]
+        self.audio = None
 
         # Update file paths
         self.audio_file = os.path.join(
@@ -178,8 +180,9 @@ class ProcessingController:
         if progress_callback:
             progress_callback("Loading audio file...")
 
-        # Load audio as AudioSegment
+        # Load audio as AudioSegment and keep it for the transcription step
         audio = AudioSegment.from_file(self.audio_file)
+        self.audio = audio
 
         if progress_callback:
             progress_callback("Detecting speech segments...")
@@ -193,8 +196,8 @@ class ProcessingController:
             post_speech_padding_sec=self.segment_params["post_speech_padding_sec"],
         )
 
-        # Save segments
-        save_json(segments, self.segments_file)
+        # Save segments (only read back by the transcription step)
+        save_json(segments, self.segments_file, pretty=False)
 
         if progress_callback:
             progress_callback(f"Saved raw segments to {self.segments_file}")
@@ -220,8 +223,10 @@ class ProcessingController:
         if progress_callback:
             progress_callback("Loading audio and segments...")
 
-        # Load audio and segments
-        audio = AudioSegment.from_file(self.audio_file)
+        # Load audio (reusing the copy decoded during detection) and segments
+        audio = self.audio
+        if audio is None:
+            audio = AudioSegment.from_file(self.audio_file)
         segments = load_json(self.segments_file)
 
         if progress_callback:
@@ -229,6 +234,7 @@ class ProcessingController:
 
         # Transcribe segments
         transcription = transcribe_segments(audio, segments)
+        self.audio = None
 
         # Save transcription
         save_json(transcription, self.transcription_file)
@@ -299,12 +305,8 @@ class ProcessingController:
         if progress_callback:
             progress_callback("Generating SRT file...")
 
-        # Create SRT content
-        srt_content = create_srt_from_json(suggestion)
-
-        # Save SRT file
-        with open(self.srt_file, "w", encoding="utf-8") as f:
-            f.write(srt_content)
+        # Create and save SRT file
+        save_srt(suggestion, self.srt_file)
 
         if progress_callback:
             progress_callback(f"Saved SRT file to {self.srt_file}")
@@ -1,5 +1,9 @@
+import io
 import os
-import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from openai import OpenAI
 
 # Instantiate the client
@@ -17,33 +21,47 @@ if not api_key:
 
 client = OpenAI(api_key=api_key)
 
-def transcribe_audio_segment(segment_audio_path):
-    """Transcribe an audio segment using Whisper via the OpenAI API."""
-    with open(segment_audio_path, "rb") as f:
-        transcript = client.audio.transcriptions.create(
-            model="whisper-1", file=f, response_format="json"
-        )
+def transcribe_audio_segment(segment_audio_file, language=None):
+    """
+    Transcribe an audio segment using Whisper via the OpenAI API.
+    segment_audio_file is anything the client accepts as a file, such as an open
+    binary file or a (filename, bytes) tuple.
+    If language (an ISO-639-1 code such as "en") is given, Whisper skips its own
+    language detection for the segment.
+    """
+    options = {"language": language} if language else {}
+    transcript = client.audio.transcriptions.create(
+        model="whisper-1", file=segment_audio_file, response_format="json", **options
+    )
     transcript_data = transcript.model_dump()
     return transcript_data.get("text", "")
 
-def transcribe_segments(audio, segments):
+def transcribe_segment(audio, seg, language=None):
+    """Encode a single segment as an in-memory WAV and transcribe it."""
+    # Slice the PCM through a memoryview so no intermediate AudioSegment is copied
+    start = int(seg["start"] * audio.frame_rate) * audio.frame_width
+    end = int(seg["end"] * audio.frame_rate) * audio.frame_width
+    wav_buffer = io.BytesIO()
+    with wave.open(wav_buffer, "wb") as wav_file:
+        wav_file.setnchannels(audio.channels)
+        wav_file.setsampwidth(audio.sample_width)
+        wav_file.setframerate(audio.frame_rate)
+        wav_file.writeframes(memoryview(audio.raw_data)[start:end])
+    text = transcribe_audio_segment(("segment.wav", wav_buffer.getvalue()), language)
+    return {
+        "start": seg["start"],
+        "end": seg["end"],
+        "text": text.strip()
+    }
+
+def transcribe_segments(audio, segments, max_workers=4, language=None):
     """
-    For each detected segment, export its audio to a temporary file and transcribe it.
+    For each detected segment, encode its audio as WAV in memory and transcribe it.
+    Up to max_workers segments are sent to the API concurrently; the output keeps
+    the order of the input segments.
+    Pass language when the spoken language is known so that every segment is
+    transcribed in it instead of being detected segment by segment.
     Returns a list of dicts with keys: start, end, text.
     """
-    transcriptions = []
-    for seg in segments:
-        start_ms = int(seg["start"] * 1000)
-        end_ms = int(seg["end"] * 1000)
-        segment_audio = audio[start_ms:end_ms]
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            segment_audio.export(tmp.name, format="wav")
-            tmp_path = tmp.name
-        text = transcribe_audio_segment(tmp_path)
-        os.remove(tmp_path)
-        transcriptions.append({
-            "start": seg["start"],
-            "end": seg["end"],
-            "text": text.strip()
-        })
-    return transcriptions
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(partial(transcribe_segment, audio, language=language), segments))
@@ -0,0 +1,38 @@
+import os
+import subprocess
+
+from moviepy.config import get_setting
+
+
+def run_ffmpeg(args, capture_stdout=False):
+    """Run ffmpeg with the given arguments.
+
+    ffmpeg is detached from the terminal's stdin, so a backgrounded run is not
+    stopped and a stray keypress cannot abort it, and on Windows it runs
+    without opening a console window. stderr is captured so that a failure
+    reports ffmpeg's own error message.
+
+    Args:
+        args: Arguments to pass to the ffmpeg binary
+        capture_stdout: Return ffmpeg's stdout instead of discarding it
+
+    Returns:
+        bytes: ffmpeg's stdout if capture_stdout is True, otherwise None
+
+    Raises:
+        RuntimeError: If ffmpeg exits with a non-zero status
+    """
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    result = subprocess.run(
+        [get_setting("FFMPEG_BINARY"), "-nostdin", *args],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        **kwargs,
+    )
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg exited with status {result.returncode}: {message}")
+    return result.stdout if capture_stdout else None
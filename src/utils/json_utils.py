@@ -1,12 +1,31 @@
 import json
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
 
-def save_json(data, filename):
-    """Save data to a JSON file."""
+
+def save_json(data, filename, pretty=True):
+    """Save data to a JSON file.
+
+    Args:
+        data: The data to save
+        filename: Path to the JSON file to write
+        pretty: Indent the output for people to read; pass False for files
+            that are only read back by the program
+    """
     os.makedirs(os.path.dirname(filename), exist_ok=True)
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(data, option=option))
+        return
     with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        json.dump(data, f, indent=2 if pretty else None)
 
 
 def load_json(filename):
@@ -22,5 +41,8 @@ def load_json(filename):
         FileNotFoundError: If the file doesn't exist
         json.JSONDecodeError: If the file contains invalid JSON
     """
+    if orjson is not None:
+        with open(filename, "rb") as f:
+            return orjson.loads(f.read())
     with open(filename, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -1,17 +1,16 @@
+import os
+
+
 def format_timestamp(seconds):
     """Convert seconds to SRT timestamp format (HH:MM:SS,mmm)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds = seconds % 60
-    milliseconds = int((seconds % 1) * 1000)
-    seconds = int(seconds)
+    seconds, milliseconds = divmod(round(seconds * 1000), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
     return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
 
 
-def create_srt_from_json(segments_data):
-    """Convert JSON segments to SRT format"""
-    srt_lines = []
-
+def iter_srt_blocks(segments_data):
+    """Yield JSON segments as SRT entries, one block at a time"""
     # Check if segments_data is a dictionary with 'filtered_transcription' key
     if isinstance(segments_data, dict) and "filtered_transcription" in segments_data:
         segments = segments_data["filtered_transcription"]
@@ -23,14 +22,17 @@ def create_srt_from_json(segments_data):
         end_time = format_timestamp(segment["end"])
         text = segment["text"]
 
-        # SRT entry format
-        srt_lines.extend(
-            [
-                str(i),
-                f"{start_time} --> {end_time}",
-                text,
-                "",  # Empty line between entries
-            ]
-        )
-
-    return "\n".join(srt_lines)
+        # SRT entry format, followed by an empty line between entries
+        yield f"{i}\n{start_time} --> {end_time}\n{text}\n\n"
+
+
+def create_srt_from_json(segments_data):
+    """Convert JSON segments to SRT format"""
+    return "".join(iter_srt_blocks(segments_data))
+
+
+def save_srt(segments_data, filename):
+    """Convert JSON segments to SRT format and stream them to a file."""
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "wb") as f:
+        f.writelines(block.encode("utf-8") for block in iter_srt_blocks(segments_data))
@@ -1,13 +1,12 @@
 def format_timestamp_txt(seconds):
     """Convert seconds to HH:MM:SS:FF format (FF is frames, assuming 30fps)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds_remaining = seconds % 60
-    seconds_int = int(seconds_remaining)
-    # Convert fractional seconds to frames (assuming 30fps)
-    frames = int((seconds_remaining - seconds_int) * 30)
+    seconds, milliseconds = divmod(round(seconds * 1000), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    # Convert the remaining milliseconds to whole frames (assuming 30fps)
+    frames = milliseconds * 30 // 1000
     
-    return f"{hours:02d}:{minutes:02d}:{seconds_int:02d}:{frames:02d}"
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}:{frames:02d}"
 
 def create_txt_from_json(segments):
     """Convert JSON segments to the specified text format"""
@@ -1,41 +1,132 @@
 import os
+import tempfile
 
-from moviepy.editor import VideoFileClip, concatenate_videoclips
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
 
+from src.utils.ffmpeg_utils import run_ffmpeg
 
-def create_final_video(video_path, segments, output_path=None):
-    """Create the final video by concatenating the selected segments."""
+
+def _merge_segments(segments, max_gap=0.05):
+    """Collapse (start, end) pairs separated by no more than max_gap seconds."""
+    merged = []
+    for start, end in sorted(segments):
+        if merged and start - merged[-1][1] <= max_gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _build_concat_list(video_path, segments):
+    """Build a concat-demuxer script that cuts each segment from the source."""
+    # Escape single quotes per the concat demuxer's quoting rules
+    source = os.path.abspath(video_path).replace("\\", "/").replace("'", "'\\''")
+    entries = []
+    for start, end in segments:
+        entries.append(f"file '{source}'\ninpoint {start:.3f}\noutpoint {end:.3f}\n")
+    return "".join(entries)
+
+
+def _build_filter_graph(segments, with_audio=True):
+    """Build a trim/concat filter graph that cuts each segment frame-accurately.
+
+    With with_audio=False only the video stream is trimmed and concatenated,
+    for sources that have no audio track.
+    """
+    filters = []
+    pads = []
+    for i, (start, end) in enumerate(segments):
+        chain = (
+            f"[0:v]trim=start={start:.3f}:end={end:.3f}," f"setpts=PTS-STARTPTS[v{i}];"
+        )
+        pad = f"[v{i}]"
+        if with_audio:
+            chain += (
+                f"[0:a]atrim=start={start:.3f}:end={end:.3f},"
+                f"asetpts=PTS-STARTPTS[a{i}];"
+            )
+            pad += f"[a{i}]"
+        filters.append(chain)
+        pads.append(pad)
+    outputs = "[outv][outa]" if with_audio else "[outv]"
+    filters.append(
+        f"{''.join(pads)}concat=n={len(segments)}:v=1:a={int(with_audio)}{outputs}"
+    )
+    return "\n".join(filters)
+
+
+def _has_audio(video_path):
+    """Check whether the video file contains an audio stream."""
+    return ffmpeg_parse_infos(video_path).get("audio_found", False)
+
+
+def _write_temp_script(content):
+    """Write an ffmpeg script to a temporary file and return its path."""
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", encoding="utf-8", delete=False
+    ) as tmp:
+        tmp.write(content)
+    return tmp.name
+
+
+def create_final_video(
+    video_path,
+    segments,
+    output_path=None,
+    stream_copy=False,
+    video_codec="libx264",
+    audio_codec="aac",
+    preset="veryfast",
+):
+    """Create the final video by concatenating the selected segments.
+
+    The cut is done by ffmpeg in a single pass. By default the segments are
+    trimmed frame-accurately and re-encoded with video_codec/audio_codec
+    (preset is passed to the video encoder unless None); with
+    stream_copy=True the streams are copied through the concat demuxer
+    instead, which is much faster but snaps each cut to the nearest keyframe.
+    """
     # Check if segments is a dictionary with 'filtered_transcription' key
     if isinstance(segments, dict) and "filtered_transcription" in segments:
         segments = segments["filtered_transcription"]
 
-    video = VideoFileClip(video_path)
-    clips = []
+    cuts = []
     for seg in segments:
         start = seg["start"]
         end = seg["end"]
         if end - start > 0.1:  # Only include segments longer than 0.1 seconds
-            clips.append(video.subclip(start, end))
-
-    if clips:
-        final_clip = concatenate_videoclips(clips)
+            cuts.append((start, end))
+    cuts = _merge_segments(cuts)
 
-        # If output_path is not provided, create a default path
-        if output_path is None:
-            os.makedirs("edited", exist_ok=True)
-            output_path = os.path.join("edited", os.path.basename(video_path))
+    # If output_path is not provided, create a default path
+    if output_path is None:
+        os.makedirs("edited", exist_ok=True)
+        output_path = os.path.join("edited", os.path.basename(video_path))
 
+    if cuts:
         # Ensure the directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-        # Disable the tqdm progress bar to prevent the NoneType error
-        final_clip.write_videofile(
-            output_path,
-            codec="libx264",
-            audio_codec="aac",
-            logger=None,  # Disable the default logger to prevent NoneType error
-        )
-        final_clip.close()
-    video.close()
+        args = ["-y", "-loglevel", "error"]
+        if stream_copy:
+            script_path = _write_temp_script(_build_concat_list(video_path, cuts))
+            args += ["-f", "concat", "-safe", "0", "-i", script_path, "-c", "copy"]
+        else:
+            with_audio = _has_audio(video_path)
+            script_path = _write_temp_script(_build_filter_graph(cuts, with_audio))
+            # -filter_complex_script is deprecated since FFmpeg 7 in favour of
+            # "-/filter_complex <file>", which older builds do not understand
+            args += ["-i", video_path, "-filter_complex_script", script_path]
+            args += ["-map", "[outv]", "-c:v", video_codec]
+            if with_audio:
+                args += ["-map", "[outa]", "-c:a", audio_codec]
+            if preset is not None:
+                args += ["-preset", preset]
+        args.append(output_path)
+
+        try:
+            run_ffmpeg(args)
+        finally:
+            os.remove(script_path)
 
     return output_path